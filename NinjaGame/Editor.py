@@ -1,24 +1,50 @@
 import pygame
 import sys
-from scripts.Utilities import load_images, Animation
+from scripts.Utilities import load_images, Animation, blit_batch
 from scripts.Tilemap import Tilemap
 
-RENDER_SCALE = 2.0  # How much to upscale the low-res display for a pixel-art effect.
+RENDER_SCALE = 2  # How much tiles are upscaled by for a pixel-art effect. Kept an int so mouse maths stays integer
+# The only event types the editor handles, anything else (e.g. mouse motion) is never queued.
+# The window events mean the window's contents were lost or hidden, so they only trigger a full redraw
+WATCHED_EVENTS = (pygame.QUIT, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.KEYDOWN, pygame.KEYUP,
+                  pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED, pygame.VIDEOEXPOSE)
+
+# Lookup tables used by the event handling in place of if-chains
+HELD_BUTTONS = {1: 'clicking', 3: 'right_clicking'}  # Mouse button -> flag that is set while it is held
+WHEEL_STEPS = {4: -1, 5: 1}  # Scroll wheel button -> direction to cycle the tile selection
+
+def camera_step(scroll, scroll_step, mpos, tile_size):
+    """
+    All of the editor's per-frame camera and cursor maths in one place.
+    Moves scroll by scroll_step and works out which tile mpos (low-res mouse position) is over.
+    Returns the new scroll, the tile position, and where the ghost tile goes in window pixels.
+    """
+    scroll_x = scroll[0] + scroll_step[0]
+    scroll_y = scroll[1] + scroll_step[1]
+    tile_x = (mpos[0] + scroll_x) // tile_size
+    tile_y = (mpos[1] + scroll_y) // tile_size
+    ghost_pos = ((tile_x * tile_size - scroll_x) * RENDER_SCALE, (tile_y * tile_size - scroll_y) * RENDER_SCALE)
+    return [scroll_x, scroll_y], (tile_x, tile_y), ghost_pos
 
 class Editor:
     def __init__(self):
         pygame.init()
         pygame.display.set_caption('editor')
 
-        # Main window (scaled) and low-res display surface
+        # Main window, everything is drawn straight onto it at RENDER_SCALE
         self.screen = pygame.display.set_mode((640, 480))
-        self.display = pygame.Surface((320, 240))
         self.clock = pygame.time.Clock()
 
-        self.movement = [False, False, False, False]  # [left, right, up, down] movement flags
+        # The tiles on their own, without the ghost tile or preview. Kept between frames so the area
+        # under the ghost tile can be restored when only the mouse moves
+        self.scene = pygame.Surface(self.screen.get_size())
+
+        # Stop SDL from queueing events the editor ignores, so they are never turned into Python objects
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(WATCHED_EVENTS)
 
         # Load all tile images grouped by type
-        self.assets = {
+        tile_images = {
             'decor': load_images('tiles/decor'),
             'grass': load_images('tiles/grass'),
             'large_decor': load_images('tiles/large_decor'),
@@ -26,6 +52,25 @@ class Editor:
             'spawners': load_images('tiles/spawners')
         }
 
+        # Pre-scale every tile image once so tiles can be drawn straight to the window,
+        # rather than drawing to a low-res surface and upscaling the whole thing every frame
+        self.assets = {}
+        for tile_type, images in tile_images.items():
+            self.assets[tile_type] = [
+                pygame.transform.scale(img, (img.get_width() * RENDER_SCALE, img.get_height() * RENDER_SCALE))
+                for img in images
+            ]
+            # The scaled tiles are never drawn onto or read back, so their black colorkey can be
+            # run-length encoded, which lets SDL skip transparent runs instead of testing every pixel
+            for img in self.assets[tile_type]:
+                if img.get_colorkey():
+                    img.set_colorkey((0, 0, 0), pygame.RLEACCEL)
+
+        # Low-res (width, height) of every tile variant, used for hit-testing off-grid tiles
+        self.asset_sizes = {}
+        for tile_type, images in tile_images.items():
+            self.asset_sizes[tile_type] = [img.get_size() for img in images]
+
         self.tilemap = Tilemap(self, tile_size=16)  # Tilemap to store and render tiles
 
         # Try to load an existing map file; ignore if missing
@@ -34,159 +79,228 @@ class Editor:
         except FileNotFoundError:
             pass
 
+        # World-space rects of the off-grid tiles, in the same order as tilemap.offgrid_tiles,
+        # so the erase check can test all of them in one Rect.collidelistall call
+        self.offgrid_rects = [self.Offgrid_Rect(tile) for tile in self.tilemap.offgrid_tiles]
+
         self.scroll = [0, 0]  # Camera scroll offset in pixels
 
         # Tile selection state for the editor UI
-        self.tile_list = list(self.assets)  # Names of tile categories
+        self.tile_list = tuple(self.assets)  # Names of tile categories, fixed once loaded
+        self.variant_counts = [len(self.assets[tile_type]) for tile_type in self.tile_list]  # Variants per category
         self.tile_group = 0                 # Index of current category
         self.tile_variant = 0               # Index of tile variant in that category
         self.clicking = False               # Left mouse button is held
         self.right_clicking = False         # Right mouse button is held
         self.shift = False                  # Shift key is held (for variant selection)
         self.ongrid = True                  # Place tiles snapped to grid or freely
+        self.last_placed = None             # (tile_pos, tile_group, tile_variant) of the last grid tile placed
+        self.redraw = True                  # Whether the next frame needs the whole window redrawn
+        self.scene_dirty = True             # Whether the tiles changed and the scene surface needs re-rendering
+        self.last_mpos = None               # Mouse position on the last frame, to tell if it moved
+        self.ghost_rect = pygame.Rect(0, 0, 0, 0)  # Where the ghost tile was last drawn in the window
+        self.hud_rect = pygame.Rect(0, 0, 0, 0)    # Where the selected tile preview was last drawn
+        self.cursor_rect = pygame.Rect(0, 0, 1, 1)  # World-space point under the mouse, moved rather than rebuilt when erasing
+
+        # One-shot hotkeys, mapped to what they do
+        self.key_actions = {
+            pygame.K_g: self.Toggle_Grid,       # Toggle grid snapping
+            pygame.K_o: self.Save_Map,          # Save current map to file
+            pygame.K_t: self.Auto_Tile,         # Apply autotiling to smooth edges/corners
+        }
+
+        # Semi-transparent previews of the selected tile, keyed by (tile_group, tile_variant)
+        self.preview_cache = {}
+
+    def Toggle_Grid(self):
+        """
+        Switches between placing tiles snapped to the grid and placing them freely.
+        """
+        self.ongrid = not self.ongrid
+
+    def Save_Map(self):
+        """
+        Saves the current map to file.
+        """
+        self.tilemap.Save('data/maps/map.json')
+
+    def Auto_Tile(self):
+        """
+        Autotiles the map, then marks the scene for re-rendering since tile variants may have changed.
+        """
+        self.tilemap.AutoTile()
+        self.scene_dirty = True
+
+    def Offgrid_Rect(self, tile):
+        """
+        Returns the world-space rect covered by an off-grid tile.
+        """
+        width, height = self.asset_sizes[tile['type']][tile['variant']]
+        return pygame.Rect(tile['pos'][0], tile['pos'][1], width, height)
+
+    def Tile_Preview(self):
+        """
+        Returns a semi-transparent copy of the currently selected tile.
+        The copy is only made the first time a tile is selected, then reused every frame.
+        """
+        key = (self.tile_group, self.tile_variant)
+        if key not in self.preview_cache:
+            preview = self.assets[self.tile_list[self.tile_group]][self.tile_variant].copy()
+            preview.set_alpha(100)
+            self.preview_cache[key] = preview
+        return self.preview_cache[key]
 
     def Run(self):
         # Main editor loop
         while True:
-            self.display.fill((0, 0, 0))  # Clear display
-
-            # Move camera based on WASD keys (movement flags)
-            self.scroll[0] += (self.movement[1] - self.movement[0]) * 2  # right-left
-            self.scroll[1] += (self.movement[3] - self.movement[2]) * 2  # down-up
-
-            render_scroll = (int(self.scroll[0]), int(self.scroll[1]))
-            self.tilemap.Render(self.display, offset=render_scroll)  # Draw visible tiles
-
-            # Get current selected tile image and make it semi-transparent as a preview
-            current_tile_img = self.assets[self.tile_list[self.tile_group]][self.tile_variant].copy()
-            current_tile_img.set_alpha(100)
-
-            # Mouse position adjusted for render scale and scroll
-            mpos = pygame.mouse.get_pos()
-            mpos = (mpos[0] / RENDER_SCALE, mpos[1] / RENDER_SCALE)
-            tile_pos = (
-                int((mpos[0] + self.scroll[0]) // self.tilemap.tile_size),
-                int((mpos[1] + self.scroll[1]) // self.tilemap.tile_size)
-            )
-
-            # Draw a ghost tile under the mouse cursor (grid-aligned or free)
-            if self.ongrid:
-                self.display.blit(
-                    current_tile_img,
-                    (tile_pos[0] * self.tilemap.tile_size - self.scroll[0],
-                     tile_pos[1] * self.tilemap.tile_size - self.scroll[1])
+            # Mouse position in low-res (unscaled) pixels, tile positions are worked out from this.
+            # Whole pixels are all that's drawn, so it's kept as integers. The raw window position is
+            # only needed to place off-grid tiles at half-pixel precision
+            raw_mpos = pygame.mouse.get_pos()
+            mpos = (raw_mpos[0] // RENDER_SCALE, raw_mpos[1] // RENDER_SCALE)
+
+            # Camera movement this frame based on which WASD keys are held. SDL already tracks the keyboard
+            # state, so it is read directly instead of being mirrored from key events
+            keys = pygame.key.get_pressed()
+            scroll_step = ((keys[pygame.K_d] - keys[pygame.K_a]) * 2,   # right-left
+                           (keys[pygame.K_s] - keys[pygame.K_w]) * 2)   # down-up
+
+            # Work out how much of the frame needs redrawing. The tiles are only re-rendered (including clearing
+            # the scene to black) when the map was edited or the camera moved. The whole window is redrawn after
+            # any input event, and if only the mouse moved, just the ghost tile is moved. Otherwise nothing is drawn
+            scene_dirty = self.scene_dirty or scroll_step != (0, 0)
+            scene_changed = self.redraw or scene_dirty
+            cursor_moved = mpos != self.last_mpos
+            self.redraw = False
+            self.scene_dirty = False
+            self.last_mpos = mpos
+
+            if scene_changed or cursor_moved:
+                # The current selection, looked up once and reused for the rest of the frame
+                tile_group = self.tile_group
+                tile_variant = self.tile_variant
+                tile_type = self.tile_list[tile_group]
+                grid_tiles = self.tilemap.tilemap
+
+                # Move the camera, then find the tile under the mouse
+                self.scroll, tile_pos, ghost_pos = camera_step(
+                    self.scroll,
+                    scroll_step,
+                    mpos,
+                    self.tilemap.tile_size
                 )
-            else:
-                self.display.blit(current_tile_img, mpos)
-
-            # Place or erase tiles based on mouse buttons
-            if self.clicking and self.ongrid:
-                # Place tile in the grid dictionary
-                self.tilemap.tilemap[str(tile_pos[0]) + ';' + str(tile_pos[1])] = {
-                    'type': self.tile_list[self.tile_group],
-                    'variant': self.tile_variant,
-                    'pos': tile_pos
-                }
-            if self.right_clicking:
-                # Remove tile from grid if it exists
-                tile_loc = str(tile_pos[0]) + ';' + str(tile_pos[1])
-                if tile_loc in self.tilemap.tilemap:
-                    del self.tilemap.tilemap[tile_loc]
-                # Also check and remove any off-grid decorations at mouse location
-                for tile in self.tilemap.offgrid_tiles.copy():
-                    tile_img = self.assets[tile['type']][tile['variant']]
-                    tile_r = pygame.Rect(
-                        tile['pos'][0] - self.scroll[0],
-                        tile['pos'][1] - self.scroll[1],
-                        tile_img.get_width(),
-                        tile_img.get_height()
-                    )
-                    if tile_r.collidepoint(mpos):
-                        self.tilemap.offgrid_tiles.remove(tile)
-
-            # Show currently selected tile preview in corner of screen
-            self.display.blit(current_tile_img, (5, 5))
+
+                if scene_dirty:
+                    # Redraw the tiles into the scene surface
+                    self.scene.fill((0, 0, 0))
+                    render_scroll = (int(self.scroll[0]), int(self.scroll[1]))
+                    self.tilemap.Render(self.scene, offset=render_scroll, scale=RENDER_SCALE)
+                if scene_changed:
+                    # Copy the whole scene to the window
+                    self.screen.blit(self.scene, (0, 0))
+                else:
+                    # Only the cursor moved, so just cover up the old ghost tile and the preview with the scene
+                    # behind them. The preview is semi-transparent, so it has to be restored before drawing it again
+                    self.screen.blit(self.scene, self.ghost_rect, self.ghost_rect)
+                    self.screen.blit(self.scene, self.hud_rect, self.hud_rect)
+
+                # Get the semi-transparent preview of the currently selected tile
+                current_tile_img = self.Tile_Preview()
+
+                # Draw a ghost tile under the mouse cursor (grid-aligned or free), scaled up to window pixels
+                if not self.ongrid:
+                    ghost_pos = (mpos[0] * RENDER_SCALE, mpos[1] * RENDER_SCALE)
+                hud_pos = (5 * RENDER_SCALE, 5 * RENDER_SCALE)  # Selected tile preview in the corner of the screen
+                # Draw the ghost tile and preview in a single call
+                blit_batch(self.screen, [(current_tile_img, ghost_pos), (current_tile_img, hud_pos)])
+
+                old_ghost_rect = self.ghost_rect
+                self.ghost_rect = current_tile_img.get_rect(topleft=ghost_pos)
+                self.hud_rect = current_tile_img.get_rect(topleft=hud_pos)
+                if scene_changed:
+                    pygame.display.update()
+                else:
+                    # Only push the parts of the window that changed: where the ghost was, where it is now and the preview
+                    pygame.display.update([old_ghost_rect, self.ghost_rect, self.hud_rect])
+
+                # Place or erase tiles based on mouse buttons
+                if self.clicking and self.ongrid:
+                    # Place tile in the grid dictionary, only when the cursor has moved to another cell or
+                    # the selection changed, rather than rewriting the same tile every frame the button is held
+                    placement = (tile_pos, tile_group, tile_variant)
+                    if placement != self.last_placed:
+                        grid_tiles[tile_pos] = {
+                            'type': tile_type,
+                            'variant': tile_variant,
+                            'pos': tile_pos
+                        }
+                        self.last_placed = placement
+                        self.scene_dirty = True
+                if self.right_clicking:
+                    # Remove tile from grid if it exists
+                    if tile_pos in grid_tiles:
+                        del grid_tiles[tile_pos]
+                        self.last_placed = None  # The cell is empty again, so it can be placed into
+                        self.scene_dirty = True
+                    # Also check and remove any off-grid decorations at mouse location
+                    # collidelistall tests the cursor against every off-grid rect in one C-level pass,
+                    # hits are deleted backwards so the remaining indices stay valid
+                    cursor = self.cursor_rect
+                    cursor.topleft = (mpos[0] + self.scroll[0], mpos[1] + self.scroll[1])
+                    for i in reversed(cursor.collidelistall(self.offgrid_rects)):
+                        del self.tilemap.offgrid_tiles[i]
+                        del self.offgrid_rects[i]
+                        self.scene_dirty = True
 
             # Handle events: quitting, placing/removing tiles, switching tiles, saving, autotiling
-            for event in pygame.event.get():
+            for event in pygame.event.get(WATCHED_EVENTS, pump=True):
+                self.redraw = True  # Any handled event may change what is drawn next frame
+
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     sys.exit()
 
                 if event.type == pygame.MOUSEBUTTONDOWN:
-                    if event.button == 1:  # Left click: start placing tiles
-                        self.clicking = True
-                        if not self.ongrid:
-                            # Place a freely positioned decoration
-                            self.tilemap.offgrid_tiles.append({
-                                'type': self.tile_list[self.tile_group],
-                                'variant': self.tile_variant,
-                                'pos': (mpos[0] + self.scroll[0], mpos[1] + self.scroll[1])
-                            })
-                    if event.button == 3:  # Right click: start erasing
-                        self.right_clicking = True
+                    # Left click: start placing tiles, right click: start erasing
+                    if event.button in HELD_BUTTONS:
+                        setattr(self, HELD_BUTTONS[event.button], True)
+                    if event.button == 1 and not self.ongrid:
+                        # Place a freely positioned decoration
+                        scroll_x, scroll_y = self.scroll
+                        tile = {
+                            'type': self.tile_list[self.tile_group],
+                            'variant': self.tile_variant,
+                            'pos': (raw_mpos[0] / RENDER_SCALE + scroll_x, raw_mpos[1] / RENDER_SCALE + scroll_y)
+                        }
+                        self.tilemap.offgrid_tiles.append(tile)
+                        self.offgrid_rects.append(self.Offgrid_Rect(tile))
+                        self.scene_dirty = True
 
                     # Scroll wheel switches variants or categories
-                    if self.shift:  # Holding shift cycles variants within a category
-                        if event.button == 4:
-                            self.tile_variant = (self.tile_variant - 1) % len(
-                                self.assets[self.tile_list[self.tile_group]])
-                        if event.button == 5:
-                            self.tile_variant = (self.tile_variant + 1) % len(
-                                self.assets[self.tile_list[self.tile_group]])
-                    else:  # Without shift, cycle tile groups (categories)
-                        if event.button == 4:
-                            self.tile_group = (self.tile_group - 1) % len(self.tile_list)
-                            self.tile_variant = 0
-                        if event.button == 5:
-                            self.tile_group = (self.tile_group + 1) % len(self.tile_list)
+                    step = WHEEL_STEPS.get(event.button)
+                    if step:
+                        if self.shift:  # Holding shift cycles variants within a category
+                            self.tile_variant = (self.tile_variant + step) % self.variant_counts[self.tile_group]
+                        else:  # Without shift, cycle tile groups (categories)
+                            self.tile_group = (self.tile_group + step) % len(self.tile_list)
                             self.tile_variant = 0
 
                 if event.type == pygame.MOUSEBUTTONUP:
+                    if event.button in HELD_BUTTONS:
+                        setattr(self, HELD_BUTTONS[event.button], False)
                     if event.button == 1:
-                        self.clicking = False
-                    if event.button == 3:
-                        self.right_clicking = False
+                        self.last_placed = None
 
                 if event.type == pygame.KEYDOWN:
-                    # Movement keys for camera scrolling
-                    if event.key == pygame.K_a:
-                        self.movement[0] = True
-                    if event.key == pygame.K_d:
-                        self.movement[1] = True
-                    if event.key == pygame.K_w:
-                        self.movement[2] = True
-                    if event.key == pygame.K_s:
-                        self.movement[3] = True
-                    # Toggle grid snapping
-                    if event.key == pygame.K_g:
-                        self.ongrid = not self.ongrid
-                    # Save current map to file
-                    if event.key == pygame.K_o:
-                        self.tilemap.Save('data/maps/map.json')
-                    # Apply autotiling to smooth edges/corners
-                    if event.key == pygame.K_t:
-                        self.tilemap.AutoTile()
-                    # Hold shift for variant selection
-                    if event.key == pygame.K_LSHIFT:
+                    if event.key == pygame.K_LSHIFT:  # Hold shift for variant selection
                         self.shift = True
+                    elif event.key in self.key_actions:  # One-shot hotkeys
+                        self.key_actions[event.key]()
 
                 if event.type == pygame.KEYUP:
-                    # Stop movement when key released
-                    if event.key == pygame.K_a:
-                        self.movement[0] = False
-                    if event.key == pygame.K_d:
-                        self.movement[1] = False
-                    if event.key == pygame.K_w:
-                        self.movement[2] = False
-                    if event.key == pygame.K_s:
-                        self.movement[3] = False
                     if event.key == pygame.K_LSHIFT:
                         self.shift = False
 
-            # Upscale the low-res display surface and draw to the screen
-            self.screen.blit(pygame.transform.scale(self.display, self.screen.get_size()), (0, 0))
-            pygame.display.update()
             self.clock.tick(60)  # Cap frame rate at 60 FPS
 
 # Create and run the editor
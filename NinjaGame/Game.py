@@ -9,9 +9,12 @@ from scripts.Clouds import Clouds
 from scripts.Entities import Player, Enemy
 from scripts.Particle import Particle
 from scripts.Tilemap import Tilemap
-from scripts.Utilities import Animation, load_image, load_images
+from scripts.Utilities import Animation, load_image, load_images, blit_batch
 from scripts.Spark import Spark
 
+# The only event types the game handles, anything else (e.g. mouse motion) is never queued
+WATCHED_EVENTS = (pygame.QUIT, pygame.KEYDOWN, pygame.KEYUP)
+
 
 # -- Game class --
 # creating game class, a game object to deal with image rendering, window running, user inputs etc
@@ -22,6 +25,10 @@ class Game:
 
         pygame.display.set_caption("ninja game")
 
+        # Stop SDL from queueing events the game ignores, so they are never turned into Python objects
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(WATCHED_EVENTS)
+
         """
         Creates a window and then a surface with 2x less resolution 
         The surface will be blitted to the display - we will blit images to the display
@@ -34,6 +41,22 @@ class Game:
         # self.display: the main rendering surface where entities and effects are drawn.
         # Using SRCALPHA enables per-pixel transparency for later mask operations.
         self.display_2 = pygame.Surface((320, 240))
+        # Half the display size, used every frame to keep the camera centered on the player
+        self.display_half_size = (self.display.get_width() / 2, self.display.get_height() / 2)
+
+        # self.silhouette: scratch surface for the outline effect, reused every frame.
+        # It ends up semi-transparent black wherever self.display has something drawn on it.
+        self.silhouette = pygame.Surface((320, 240), pygame.SRCALPHA)
+        # The silhouette shifted left, right, up and down by one pixel, drawn together to make the outline
+        self.outline_blits = [(self.silhouette, offset) for offset in [(-1, 0), (1, 0), (0, -1), (0, 1)]]
+
+        # self.transition_surface: the level transition wipe, reused every frame a transition is running.
+        # White is transparent, so only the black outside the circle shows.
+        self.transition_surface = pygame.Surface(self.display.get_size())
+        self.transition_surface.set_colorkey((255, 255, 255))
+
+        # self.scaled_display: display_2 scaled up to the window size, reused every frame the screen shakes
+        self.scaled_display = pygame.Surface(self.screen.get_size())
        
 
         self.clock = pygame.time.Clock()
@@ -82,6 +105,8 @@ class Game:
                 load_images("particles/particle"), image_duration=6, loop=False
             )
         }
+        # The gun mirrored for enemies facing left, made once here rather than flipping it every time one is drawn
+        self.assets['gun/flipped'] = pygame.transform.flip(self.assets['gun'], True, False)
 
         self.sfx = {
             'jump': pygame.mixer.Sound('data/sfx/jump.wav'),
@@ -105,8 +130,13 @@ class Game:
         # --Tilemap initialisation--
         self.tilemap = Tilemap(self, tile_size=16)
 
+        # Finished particles and sparks, kept so new ones can reuse them instead of allocating (see Spawn_Particle)
+        self.particle_pool = []
+        self.spark_pool = []
+
         # --Level data-
         self.level = 0
+        self.map_count = len(os.listdir('data/maps'))  # Number of levels, counted once rather than on every level change
         self.Load_Level(self.level) # load the first level
 
         self.screenshake = 0 # Holds the current intensity of the screen shake effect (bigger number = more shake)
@@ -130,6 +160,12 @@ class Game:
             self.leaf_spawners.append(
                 pygame.Rect(4 + tree["pos"][0], 4 + tree["pos"][1], 23, 13)
             )
+        # The spawners never move, so their bounds and per-frame spawn chance are worked out once here.
+        # The chance is proportional to the spawner's area, larger area = higher spawn chance
+        self.leaf_spawns = [
+            (rect.x, rect.y, rect.width, rect.height, rect.width * rect.height / 49999)
+            for rect in self.leaf_spawners
+        ]
 
         # ENEMY AND PLAYER SPAWNING
         self.enemies = []
@@ -156,6 +192,29 @@ class Game:
         # Negative values mean the screen is "covered" (start of the transition),
         # positive values represent uncovering the screen (end of the transition).
 
+    def Spawn_Particle(self, particle_type, pos, velocity=[0, 0], frame=0):
+        """
+        Adds a particle to the game, reusing a finished one from the pool if there is one.
+        Takes the same arguments as Particle, apart from the game.
+        """
+        if self.particle_pool:
+            particle = self.particle_pool.pop()
+            particle.Reset(particle_type, pos, velocity, frame)
+        else:
+            particle = Particle(self, particle_type, pos, velocity, frame)
+        self.particles.append(particle)
+
+    def Spawn_Spark(self, pos, angle, speed):
+        """
+        Adds a spark to the game, reusing a finished one from the pool if there is one.
+        """
+        if self.spark_pool:
+            spark = self.spark_pool.pop()
+            spark.Reset(pos, angle, speed)
+        else:
+            spark = Spark(pos, angle, speed)
+        self.sparks.append(spark)
+
     # this is the main game function where we do things while the game is running such as listening to inputs
     def Run(self):
         pygame.mixer.music.load('data/music.wav')
@@ -164,11 +223,20 @@ class Game:
 
         self.sfx['ambience'].play(-1)
 
+        # Local names for the random and maths functions used in the loop, so each call is a fast local lookup
+        # instead of a global lookup followed by a module attribute lookup
+        rand = random.random
+        randint = random.randint
+        sin = math.sin
+        cos = math.cos
+        pi = math.pi
+
         # --Main loop--
         while True:
-            self.display.fill((255, 255, 255, 0))
-            # Clear the main display every frame by filling it with transparent black.
-            # This ensures old drawings don't persist between frames.
+            self.display.fill(0)
+            # Clear the main display every frame by filling it with transparent black (all channels zero).
+            # This ensures old drawings don't persist between frames. Only the alpha of cleared pixels matters,
+            # and filling with zero lets SDL clear the surface with a plain memset.
 
             self.display_2.blit(self.assets["background"], (0, 0))
             # Start by drawing the background image onto display_2 before adding outlines
@@ -185,7 +253,7 @@ class Game:
                 if self.transition > 30:
                     # When transition passes 30 (fully uncovered),
                     # move to the next level (but don't exceed the number of maps available).
-                    self.level = min(self.level + 1, len(os.listdir('data/maps')) - 1)
+                    self.level = min(self.level + 1, self.map_count - 1)
                     self.Load_Level(self.level)
 
             if self.transition < 0:
@@ -229,12 +297,12 @@ class Game:
             """
             self.scroll[0] += (
                 self.player.Rect().centerx
-                - self.display.get_width() / 2
+                - self.display_half_size[0]
                 - self.scroll[0]
             ) / 30
             self.scroll[1] += (
                 self.player.Rect().centery
-                - self.display.get_height() / 2
+                - self.display_half_size[1]
                 - self.scroll[1]
             ) / 30
             render_scroll = (
@@ -243,23 +311,19 @@ class Game:
             )  # converting to an integer to avoid floating point errors
 
             # Iterate through each leaf spawner area to randomly generate leaf particles.
-            for rect in self.leaf_spawners:
-                # Equation for probability of spawning leaves. It is proportional to the spawner's area, larger area = higher spawn chance
-                if random.random() * 49999 < rect.width * rect.height:
+            for x, y, width, height, chance in self.leaf_spawns:
+                if rand() < chance:
                     # Pick a random position within the bounds of spawner rectangle.
                     pos = (
-                        rect.x + random.random() * rect.width,
-                        rect.y + random.random() * rect.height,
+                        x + rand() * width,
+                        y + rand() * height,
                     )
                     # Create and store a new leaf particle with initial velocity and a random animation frame.
-                    self.particles.append(
-                        Particle(
-                            self,
-                            "leaf",
-                            pos,
-                            velocity=[-0.1, 0.3],
-                            frame=random.randint(0, 20),
-                        )
+                    self.Spawn_Particle(
+                        "leaf",
+                        pos,
+                        velocity=[-0.1, 0.3],
+                        frame=randint(0, 20),
                     )
 
             """
@@ -273,12 +337,16 @@ class Game:
             self.tilemap.Render(self.display, offset=render_scroll)
 
             # ENEMY UPDATES AND RENDERING
-            for enemy in self.enemies.copy():
+            # Surviving enemies are compacted to the front of the list, the same way as projectiles below
+            alive = 0
+            for enemy in self.enemies:
                 kill = enemy.Update(self.tilemap, (0, 0))  # Update AI behavior and movement.
                 enemy.Render(self.display, offset=render_scroll)  # Draw the enemy.
-                if kill:
-                    # If Update() returns True, the enemy was destroyed (e.g., by dash collision).
-                    self.enemies.remove(enemy)
+                # If Update() returns True, the enemy was destroyed (e.g., by dash collision), so it isn't kept.
+                if not kill:
+                    self.enemies[alive] = enemy
+                    alive += 1
+            del self.enemies[alive:]
 
 
             # PLAYER UPDATE AND RENDERING
@@ -288,7 +356,17 @@ class Game:
                 self.player.Render(self.display, offset=render_scroll)
 
             # PROJECTILE HANDLING
-            for projectile in self.projectiles.copy():
+            # Projectiles that survive are moved down to the front of the list as it is walked,
+            # then the leftovers are cut off the end, rather than copying the list and removing each dead one
+            # What the collision checks need is the same for every projectile this frame, so it is looked up once
+            solid_check = self.tilemap.Solid_Check
+            player_rect = self.player.Rect()
+            player_hittable = abs(self.player.dashing) < 50  # Dashing players can't be hit
+            image = self.assets['projectile']
+            half_width, half_height = image.get_width() / 2, image.get_height() / 2  # To center the image on the projectile
+            projectile_blits = []  # All projectiles are drawn together after the loop
+            alive = 0
+            for projectile in self.projectiles:
                 # projectile = [position[x,y], x_velocity, lifetime_counter]
 
                 # Move projectile horizontally.
@@ -296,37 +374,30 @@ class Game:
                 # Increase lifetime counter each frame.
                 projectile[2] += 1
 
-                # Draw the projectile at its current position, centered on its image.
-                image = self.assets['projectile']
-                self.display.blit(
-                    image,
-                    (
-                        projectile[0][0] - image.get_width() / 2 - render_scroll[0],
-                        projectile[0][1] - image.get_height() / 2 - render_scroll[1]
-                    )
-                )
+                # Queue the projectile to be drawn at its current position, centered on its image.
+                projectile_blits.append((image, (projectile[0][0] - half_width - render_scroll[0],
+                                                 projectile[0][1] - half_height - render_scroll[1])))
 
                 # --COLLISION CHECKS--
+                kill = False
                 # If the projectile hits a solid tile:
-                if self.tilemap.Solid_Check(projectile[0]):
-                    self.projectiles.remove(projectile)
+                if solid_check(projectile[0]):
+                    kill = True
                     # Create small sparks to indicate a bullet impact.
                     for _ in range(4):
-                        self.sparks.append(
-                            Spark(
-                                projectile[0],
-                                random.random() - 0.5 + (math.pi if projectile[1] > 0 else 0),
-                                2 + random.random()
-                            )
+                        self.Spawn_Spark(
+                            projectile[0],
+                            rand() - 0.5 + (pi if projectile[1] > 0 else 0),
+                            2 + rand()
                         )
                 # If projectile has existed too long, remove it.
                 elif projectile[2] > 360:
-                    self.projectiles.remove(projectile)
+                    kill = True
                 # If player is not dashing (dash < 50), check for hits.
-                elif abs(self.player.dashing) < 50:
-                    if self.player.Rect().collidepoint(projectile[0]):
+                elif player_hittable:
+                    if player_rect.collidepoint(projectile[0]):
                         # Projectile hit the player → trigger death sequence.
-                        self.projectiles.remove(projectile)
+                        kill = True
                         self.dead += 1
                         self.screenshake = max(16, self.screenshake)
                         # When hit by a projectile, ensure the screenshake is at least 16.
@@ -334,70 +405,81 @@ class Game:
                         self.sfx['hit'].play()
 
                         #--Create an explosion of sparks and particles at the player's position.--
+                        # The position and spawn methods are looked up once for the whole burst.
+                        center = player_rect.center
+                        spawn_spark = self.Spawn_Spark
+                        spawn_particle = self.Spawn_Particle
                         for _ in range(30):
-                            angle = random.random() * math.pi * 2
-                            speed = random.random() * 5
-                            self.sparks.append(Spark(self.player.Rect().center, angle, 2 + random.random()))
-                            self.particles.append(
-                                Particle(
-                                    self,
-                                    'particle',
-                                    self.player.Rect().center,
-                                    velocity=[
-                                        math.cos(angle + math.pi) * speed * 0.5,
-                                        math.sin(angle + math.pi) * speed * 0.5
-                                    ],
-                                    frame=random.randint(0, 7)
-                                )
+                            angle = rand() * pi * 2
+                            speed = rand() * 5
+                            spawn_spark(center, angle, 2 + rand())
+                            spawn_particle(
+                                'particle',
+                                center,
+                                velocity=[
+                                    cos(angle + pi) * speed * 0.5,
+                                    sin(angle + pi) * speed * 0.5
+                                ],
+                                frame=randint(0, 7)
                             )
-                
 
-            for spark in self.sparks.copy():
+                if not kill:
+                    self.projectiles[alive] = projectile
+                    alive += 1
+            del self.projectiles[alive:]
+            blit_batch(self.display, projectile_blits)
+
+            # Sparks are compacted the same way, finished ones go back to the pool to be reused
+            alive = 0
+            for spark in self.sparks:
                 # Move the spark according to its velocity and reduce its speed.
                 kill = spark.Update()
                 # Draw the spark polygon.
                 spark.Render(self.display, offset=render_scroll)
                 # If the spark has slowed to zero, remove it.
                 if kill:
-                    self.sparks.remove(spark)
-
-            display_mask = pygame.mask.from_surface(self.display)
-            # Convert all non-transparent pixels on self.display into a binary mask.
-            # Pixels with alpha > 0 become "1" (filled), and fully transparent pixels are ignored.
-
-            display_silhouette = display_mask.to_surface(setcolor=(0, 0, 0, 180), unsetcolor=(0, 0, 0, 0))
-            # Convert the mask back into a surface:
-            #   - setcolor is the color of filled mask pixels → semi-transparent black (alpha=180).
-            #   - unsetcolor is the color for empty mask pixels → fully transparent.
-            # This creates a silhouette of all visible objects on self.display.
-
-            for offset in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                # Loop over four directions: left, right, up, down.
-                # These small offsets create copies of the silhouette slightly shifted in each direction.
-                self.display_2.blit(display_silhouette, offset)
-                # Blit (draw) the shifted silhouettes onto display_2.
-                # Overlapping these shifted silhouettes around the original shapes creates a "thickened"
-                # border effect—an outline around the objects.
+                    self.spark_pool.append(spark)
+                else:
+                    self.sparks[alive] = spark
+                    alive += 1
+            del self.sparks[alive:]
+
+            self.silhouette.fill((0, 0, 0, 180))
+            self.silhouette.blit(self.display, (0, 0), special_flags=pygame.BLEND_RGBA_MIN)
+            # Build a silhouette of all visible objects on self.display:
+            #   - Fill the scratch surface with semi-transparent black (alpha=180).
+            #   - BLEND_RGBA_MIN keeps the smaller of each channel, so RGB stays black and the alpha becomes
+            #     180 where self.display is drawn on (alpha 255) and 0 where it is still transparent.
+            # Everything drawn so far is either fully opaque or fully transparent, so this matches
+            # building a mask of the display, without scanning it into a mask and back every frame.
+
+            blit_batch(self.display_2, self.outline_blits)
+            # Draw the silhouette onto display_2 four times, shifted left, right, up and down, in one call.
+            # Overlapping these shifted silhouettes around the original shapes creates a "thickened"
+            # border effect—an outline around the objects.
             
 
-            # Update and render all particles.
-            for particle in self.particles.copy():
-                kill = (
-                    particle.Update()
-                )  # Update particle position and animation and check if it should be removed.
-                particle.Render(
-                    self.display, offset=render_scroll
-                )  # Draw the particle to the screen.
+            # Update and render all particles, compacting the list and pooling finished ones like the sparks.
+            # Everything the loop uses that is the same for every particle is bound to locals first.
+            display = self.display
+            particles = self.particles
+            recycle = self.particle_pool.append
+            alive = 0
+            for particle in particles:
+                kill = particle.Update()  # Update particle position and animation and check if it should be removed.
+                particle.Render(display, render_scroll)  # Draw the particle to the screen.
+                if kill:
+                    recycle(particle)  # Remove the particle if its animation is finished.
+                    continue
                 if particle.type == "leaf":
                     # Add a horizontal sin-like motion to simulate leaves drifting side to side. Makes the motion feel less robotic
-                    particle.pos[0] += math.sin(particle.animation.frame * 0.035) * 0.3
-                if kill:
-                    self.particles.remove(
-                        particle
-                    )  # Remove the particle if its animation is finished.
+                    particle.pos[0] += sin(particle.animation.frame * 0.035) * 0.3
+                particles[alive] = particle
+                alive += 1
+            del particles[alive:]
 
             # --Pygame events--
-            for (event) in (pygame.event.get()):  # waits for user input, run every loop to avoid windows shutting the game down (windows shuts down if no inputs are being waited for)
+            for (event) in (pygame.event.get(WATCHED_EVENTS, pump=True)):  # waits for user input, run every loop to avoid windows shutting the game down (windows shuts down if no inputs are being waited for)
                 if event.type == pygame.QUIT:
                     pygame.quit
                     sys.exit()
@@ -421,7 +503,8 @@ class Game:
                         self.movement[1] = False
 
             if self.transition:
-                transition_surface = pygame.Surface(self.display.get_size())  # Create a surface the same size as the display to draw the transition effect.
+                transition_surface = self.transition_surface
+                transition_surface.fill((0, 0, 0))  # Clear last frame's circle.
                 pygame.draw.circle(
                     transition_surface,
                     (255, 255, 255),
@@ -434,9 +517,6 @@ class Game:
                     #   - (30 - abs(self.transition)) * 8 → converts this value to pixels.
                 )
 
-                transition_surface.set_colorkey((255, 255, 255))  
-                # Make white transparent so only the non-white parts show.
-
                 self.display.blit(transition_surface, (0, 0))  
                 # Blit (draw) the transition surface onto the display.
                 # As transition moves, the circle shrinks or expands, creating a "wipe" effect:
@@ -453,26 +533,36 @@ class Game:
             # By layering the two, the objects are outlined by the shifted silhouettes,
             # producing a glowing or highlighted effect without altering the actual sprites.
 
-            screenshake_offset = (
-            random.random() * self.screenshake - self.screenshake / 2,  
-            # Horizontal offset:
-            #   random.random() * self.screenshake → value between 0 and `screenshake`.
-            #   Subtracting `screenshake / 2` recenters it so the range becomes (-screenshake/2, +screenshake/2).
-            #   This ensures equal jitter in both left and right directions.
-
-            random.random() * self.screenshake - self.screenshake / 2  
-            # Vertical offset:
-            #   Same calculation as horizontal, giving a random vertical jitter.
-            )
-
             # --- APPLYING THE OFFSET TO CREATE THE SHAKE ---
-            self.screen.blit(
-                pygame.transform.scale(self.display_2, self.screen.get_size()),  # Scale display to match screen resolution.
-                screenshake_offset  # Draw (blit) the display with a small random offset to simulate shaking.
-            )
+            # Only worked out while the screen is shaking, on most frames there is no shake and no random offset.
+            if self.screenshake:
+                screenshake_offset = (
+                rand() * self.screenshake - self.screenshake / 2,  
+                # Horizontal offset:
+                #   rand() * self.screenshake → value between 0 and `screenshake`.
+                #   Subtracting `screenshake / 2` recenters it so the range becomes (-screenshake/2, +screenshake/2).
+                #   This ensures equal jitter in both left and right directions.
+
+                rand() * self.screenshake - self.screenshake / 2  
+                # Vertical offset:
+                #   Same calculation as horizontal, giving a random vertical jitter.
+                )
+
+                # Scale display to match screen resolution, into the reused surface rather than a new one.
+                pygame.transform.scale(self.display_2, self.screen.get_size(), self.scaled_display)
+                self.screen.blit(
+                    self.scaled_display,
+                    screenshake_offset  # Draw (blit) the display with a small random offset to simulate shaking.
+                )
+            else:
+                # No shake, so the offset is (0, 0) and the display can be scaled straight into the window.
+                pygame.transform.scale(self.display_2, self.screen.get_size(), self.screen)
             # As `self.screenshake` decreases over frames, the random offset becomes smaller.
             # This creates a strong initial jolt that fades out, acting as an impact
-            pygame.display.update()  # refreshes the window, this creates a motion effect as things are drawn in different positions each loop
+            pygame.display.flip()  # refreshes the window, this creates a motion effect as things are drawn in different positions each loop
+            # The whole window changes every frame, so flip() is used rather than update(), which would only
+            # end up doing the same full-window refresh after parsing its (empty) rect arguments.
+            # clock.tick(60) is kept, its sleep is accurate enough at 60 FPS and doesn't burn CPU like tick_busy_loop
             self.clock.tick(60)
 
 
@@ -1,4 +1,5 @@
 import random
+from scripts.Utilities import blit_batch
 
 """
 Parallax layering is a design technique that creates an illusion of depth on a 2D screen 
@@ -21,6 +22,7 @@ class Cloud:
         The smaller the depth, the slower the cloud moves relative to the camera
         This makes the cloud appear further away (Vice versa for a higher depth)
         """
+        self.width, self.height = img.get_size()  # Image size, used every frame to wrap the cloud around the screen
 
     def Update(self):
         """
@@ -28,25 +30,29 @@ class Cloud:
         """
         self.pos[0] += self.speed  # Move the cloud to the right each frame
 
-    def Render(self, surface, offset=(0, 0)):
+    def Screen_Pos(self, surface_size, offset=(0, 0)):
         """
-        Draws the cloud on the screen, applying parallax scrolling based on depth.
+        Returns where the cloud is drawn on a surface of size surface_size, applying parallax scrolling based on depth.
         Uses modulo wrapping so clouds repeat continuously across the screen.
         """
+        surface_width, surface_height = surface_size
         # Adjust position by the camera offset scaled by depth (parallax effect)
         render_pos = (self.pos[0] - offset[0] * self.depth, self.pos[1] - offset[1] * self.depth)
 
         # Wrap the cloud around the screen edges to create an endless sky
-        # The cloud only reappear after going completely off the screen  'surface.get_width() + self.img.get_width()'
-        # The cloud reappears slightly outside the screen '-self.img.get_width()'
-        surface.blit(
-            self.img,
-            (
-                render_pos[0] % (surface.get_width() + self.img.get_width()) - self.img.get_width(),
-                render_pos[1] % (surface.get_height() + self.img.get_height()) - self.img.get_height()
-            )
+        # The cloud only reappear after going completely off the screen  'surface_width + self.width'
+        # The cloud reappears slightly outside the screen '-self.width'
+        return (
+            render_pos[0] % (surface_width + self.width) - self.width,
+            render_pos[1] % (surface_height + self.height) - self.height
         )
 
+    def Render(self, surface, offset=(0, 0)):
+        """
+        Draws the cloud on the screen at its Screen_Pos.
+        """
+        surface.blit(self.img, self.Screen_Pos(surface.get_size(), offset))
+
 class Clouds:
     """
     Manages a collection of Cloud objects.
@@ -79,6 +85,7 @@ class Clouds:
     def Render(self, surface, offset=(0, 0)):
         """
         Renders all clouds on the screen, applying parallax effect.
+        The clouds are drawn with a single batched call, in depth order.
         """
-        for cloud in self.clouds:
-            cloud.Render(surface, offset=offset)
+        surface_size = surface.get_size()  # The same for every cloud
+        blit_batch(surface, [(cloud.img, cloud.Screen_Pos(surface_size, offset)) for cloud in self.clouds])
@@ -1,16 +1,26 @@
 import pygame
 import math
 import random
-from scripts.Particle import Particle
-from scripts.Spark import Spark
+
+# The maths used in the particle bursts, bound once at import so the loops don't look them up on the math module every iteration
+_PI = math.pi
+_TAU = math.pi * 2
+_cos = math.cos
+_sin = math.sin
 
 class PhysicsEntity:
+    # Attributes are stored in fixed slots rather than a per-instance dict, which makes each entity
+    # smaller and attribute access quicker. Every attribute an entity uses has to be listed here
+    __slots__ = ('game', 'type', 'pos', 'size', 'velocity', 'rect', 'collisions',
+                 'action', 'anim_offset', 'flip', 'animation', 'last_movement')
+
     def __init__(self, game, entity_type, pos, size):
        self.game = game
        self.type = entity_type
        self.pos = list(pos) # lists are used as their elements can be changed, unlike tuples
        self.size = size
        self.velocity = [0, 0]
+       self.rect = pygame.Rect(0, 0, size[0], size[1]) # the entity's hitbox, moved to the current position by Rect() instead of making a new one each call
        self.collisions = {'up': False, 'down': False, 'right': False, 'left': False} # used to check what direction an entity has collided with (in the current loop)
 
        self.action = ''
@@ -26,7 +36,12 @@ class PhysicsEntity:
             self.animation = self.game.assets[self.type + '/' + self.action].Copy()
 
     def Rect(self): # returns the rect of the entity, used for collisions
-        return pygame.Rect(self.pos[0], self.pos[1], self.size[0], self.size[1])
+        # The same Rect is returned every call, only its position is updated. int() truncates like the Rect
+        # constructor does, assigning floats to a Rect's attributes would round them instead
+        rect = self.rect
+        rect.x = int(self.pos[0])
+        rect.y = int(self.pos[1])
+        return rect
 
     def Update(self, tilemap, movement=(0, 0)): # updates the entity's position: including its position and collision states
         self.collisions = {'up': False, 'down': False, 'right': False, 'left': False} # refreshes the states
@@ -38,7 +53,10 @@ class PhysicsEntity:
         # --- Horizontal movement and collision (world coordinates) ---
         self.pos[0] += frame_movement[0]      # Move along the x axis 
         entity_rect = self.Rect()             # Get the updated hitbox for collision checks afetr movement
-        for rect in tilemap.Physics_Rects_Around(self.pos):  # Check nearby solid tiles only
+        tile_size = tilemap.tile_size
+        tile_location = (int(self.pos[0] // tile_size), int(self.pos[1] // tile_size)) # the tile the nearby rects were found from
+        physics_rects = tilemap.Physics_Rects_Around(self.pos)
+        for rect in physics_rects:            # Check nearby solid tiles only
             if entity_rect.colliderect(rect):                # If colliding with a tile horizontally:
                 if frame_movement[0] > 0:                    # Moving right -> Right side of the hixbox collides with the tile
                     entity_rect.right = rect.left             # Snap player to the left edge of the tile
@@ -51,7 +69,11 @@ class PhysicsEntity:
         # --- Vertical movement and collision ---
         self.pos[1] += frame_movement[1]      # Move along the y axis
         entity_rect = self.Rect()             # Get the updated hitbox for collision checks after movement
-        for rect in tilemap.Physics_Rects_Around(self.pos):  # Check nearby solid tiles only
+        # The entity only moves a few pixels a frame, so it is usually still in the same tile and the
+        # nearby rects from the horizontal pass can be reused instead of searching the tilemap again
+        if (int(self.pos[0] // tile_size), int(self.pos[1] // tile_size)) != tile_location:
+            physics_rects = tilemap.Physics_Rects_Around(self.pos)
+        for rect in physics_rects:            # Check nearby solid tiles only
             if entity_rect.colliderect(rect):                # If colliding with a tile vertically:
                 if frame_movement[1] > 0:                    # Moving down -> down side of the hixbox collides with the tile
                     entity_rect.bottom = rect.top             # Snap to the top of the tile
@@ -69,19 +91,16 @@ class PhysicsEntity:
         
         self.last_movement = movement # set the last movement attribute to the movement on this frame, this means the next frame will have a reference to the movement beforehand
 
-        # Apply gravity: slowly increase downward velocity, capped at 5
-        self.velocity[1] = min(5, self.velocity[1] + 0.1)
-
         # If colliding vertically (ground or ceiling), reset vertical velocity to stop movement
-        if self.collisions['down'] or self.collisions['up']:
-            self.velocity[1] = 0
+        # Otherwise apply gravity: slowly increase downward velocity, capped at 5
+        self.velocity[1] = 0 if self.collisions['down'] or self.collisions['up'] else min(5, self.velocity[1] + 0.1)
 
         # Update the animation to match the movement
         self.animation.Update()
 
     # Render the image to the display  
     def Render(self, surface, offset=(0, 0)):
-        surface.blit(pygame.transform.flip(self.animation.Image(), self.flip, False), (self.pos[0] - offset[0] + self.anim_offset[0], self.pos[1] - offset[1] + self.anim_offset[1]))
+        surface.blit(self.animation.Image(self.flip), (self.pos[0] - offset[0] + self.anim_offset[0], self.pos[1] - offset[1] + self.anim_offset[1]))
 
 
 class Enemy(PhysicsEntity):
@@ -91,6 +110,8 @@ class Enemy(PhysicsEntity):
     and animation handling. This enemy can patrol, detect edges, reverse direction,
     shoot projectiles toward the player, and be destroyed when hit by the player's dash.
     """
+    __slots__ = ('walking',)
+
     def __init__(self, game, pos, size):
         """
         Initialize the enemy.
@@ -115,18 +136,20 @@ class Enemy(PhysicsEntity):
         """
         # If currently walking (patrolling)
         if self.walking:
-            # Look ahead: check for ground in front of the enemy to avoid falling off platforms.
-            check_pos = (self.Rect().centerx + (-7 if self.flip else 7), self.pos[1] + 23)
-            if tilemap.Solid_Check(check_pos):
-                # If there’s a collision with a wall (left or right), flip direction.
-                if self.collisions['right'] or self.collisions['left']:
-                    self.flip = not self.flip
-                else:
+            # If there’s a collision with a wall (left or right), flip direction.
+            # This is checked first as it only reads two flags, so the tilemap lookup below is skipped
+            # whenever the enemy is walking into a wall (it would flip either way).
+            if self.collisions['right'] or self.collisions['left']:
+                self.flip = not self.flip
+            else:
+                # Look ahead: check for ground in front of the enemy to avoid falling off platforms.
+                check_pos = (self.Rect().centerx + (-7 if self.flip else 7), self.pos[1] + 23)
+                if tilemap.Solid_Check(check_pos):
                     # Otherwise, continue moving left or right depending on flip.
                     movement = (movement[0] - 0.5 if self.flip else 0.5, movement[1])
-            else:
-                # If no ground is found ahead, reverse direction to stay on the platform.
-                self.flip = not self.flip
+                else:
+                    # If no ground is found ahead, reverse direction to stay on the platform.
+                    self.flip = not self.flip
 
             # Decrease walking countdown timer each frame.
             self.walking = max(0, self.walking - 1)
@@ -139,24 +162,17 @@ class Enemy(PhysicsEntity):
                 if abs(distance[1]) < 16:
                     # If facing left (flip=True) and player is to the left, shoot.
                     self.game.sfx['shoot'].play()
+                    centerx, centery = self.Rect().center  # The gun's position, shared by both directions.
                     if (self.flip and distance[0] < 0):
                         
                         # Spawn a projectile moving left (-1.5 speed).
-                        self.game.projectiles.append([[self.Rect().centerx - 7, self.Rect().centery], -1.5, 0])
+                        self.game.projectiles.append([[centerx - 7, centery], -1.5, 0])
                         # Create a small burst of sparks to simulate a muzzle flash.
-                        for _ in range(4):
-                            self.game.sparks.append(
-                                Spark(self.game.projectiles[-1][0],
-                                      random.random() - 0.5 + math.pi,
-                                      2 + random.random()))
+                        self.Muzzle_Flash(_PI)
                     # If facing right (flip=False) and player is to the right, shoot.
                     if not self.flip and distance[0] > 0:
-                        self.game.projectiles.append([[self.Rect().centerx + 7, self.Rect().centery], 1.5, 0])
-                        for _ in range(4):
-                            self.game.sparks.append(
-                                Spark(self.game.projectiles[-1][0],
-                                      random.random() - 0.5,
-                                      2 + random.random()))
+                        self.game.projectiles.append([[centerx + 7, centery], 1.5, 0])
+                        self.Muzzle_Flash(0)
         # If not currently walking, randomly decide to start walking (idle behavior).
         elif random.random() < 0.01:
             # walking is set to a random duration, making movement unpredictable.
@@ -175,32 +191,47 @@ class Enemy(PhysicsEntity):
         # Check if the player is currently dashing at high speed.
         if abs(self.game.player.dashing) >= 50:
             # If the enemy’s rectangle overlaps with the player’s rectangle during a dash:
-            if self.Rect().colliderect(self.game.player.Rect()):
+            rect = self.Rect()
+            if rect.colliderect(self.game.player.Rect()):
                 self.game.player.impact = 10
                 self.game.screenshake = max(16, self.game.screenshake)
                 self.game.sfx['hit'].play()
                 # Generate many sparks and particles for a death explosion effect.
+                # The functions called for every particle, and the point they all start from, are looked up once for the whole burst.
+                rand = random.random
+                randint = random.randint
+                spawn_particle = self.game.Spawn_Particle
+                center = rect.center
                 for _ in range(30):
                     # --- ENEMY / PROJECTILE IMPACT PARTICLES ---
                     # Similar polar-to-Cartesian conversion is used here to spawn particles.
                     # Adding π to the angle flips their direction for a more chaotic explosion effect.
-                    angle = random.random() * math.pi * 2  # Random angle in radians.
-                    speed = random.random() * 5            # Random speed up to 5 units.
-                    self.game.particles.append(
-                        Particle(self.game, 'particle', self.Rect().center, velocity=[
-                            math.cos(angle + math.pi) * speed * 0.5,  # Flip vector 180° for variety and slow it down.
-                            math.sin(angle + math.pi) * speed * 0.5
-                            ],
-                            frame=random.randint(0, 7)
-                        )
+                    angle = rand() * _TAU  # Random angle in radians.
+                    speed = rand() * 5            # Random speed up to 5 units.
+                    spawn_particle('particle', center, velocity=[
+                        _cos(angle + _PI) * speed * 0.5,  # Flip vector 180° for variety and slow it down.
+                        _sin(angle + _PI) * speed * 0.5
+                        ],
+                        frame=randint(0, 7)
                     )
 
                 # Add two stronger sparks in opposite directions for extra visual impact.
-                self.game.sparks.append(Spark(self.Rect().center, 0, 5 + random.random()))
-                self.game.sparks.append(Spark(self.Rect().center, math.pi, 5 + random.random()))
+                self.game.Spawn_Spark(center, 0, 5 + random.random())
+                self.game.Spawn_Spark(center, _PI, 5 + random.random())
                 # Return True to signal to the game loop that this enemy should be removed.
                 return True
 
+    def Muzzle_Flash(self, angle):
+        """
+        Create a small burst of sparks at the last fired projectile, spread around angle.
+        :param angle: The direction the projectile was fired in, in radians.
+        """
+        rand = random.random
+        spawn_spark = self.game.Spawn_Spark
+        muzzle = self.game.projectiles[-1][0]
+        for _ in range(4):
+            spawn_spark(muzzle, rand() - 0.5 + angle, 2 + rand())
+
     def Render(self, surface, offset=(0, 0)):
         """
         Draw the enemy and its gun to the screen.
@@ -211,24 +242,14 @@ class Enemy(PhysicsEntity):
         super().Render(surface, offset=offset)
 
         # Draw the enemy's gun based on its facing direction.
+        centerx, centery = self.Rect().center
         if self.flip:
-            # Facing left: flip the gun image horizontally and place it on the left side.
-            surface.blit(
-                pygame.transform.flip(self.game.assets['gun'], True, False),
-                (
-                    self.Rect().centerx - 4 - self.game.assets['gun'].get_width() - offset[0],
-                    self.Rect().centery - offset[1]
-                )
-            )
+            # Facing left: use the horizontally flipped gun image and place it on the left side.
+            gun = self.game.assets['gun/flipped']
+            surface.blit(gun, (centerx - 4 - gun.get_width() - offset[0], centery - offset[1]))
         else:
             # Facing right: draw the gun normally on the right side.
-            surface.blit(
-                self.game.assets['gun'],
-                (
-                    self.Rect().centerx + 4 - offset[0],
-                    self.Rect().centery - offset[1]
-                )
-            )
+            surface.blit(self.game.assets['gun'], (centerx + 4 - offset[0], centery - offset[1]))
 
 
 
@@ -237,6 +258,8 @@ class Player(PhysicsEntity):
     New class to extend PhysicsEntity to add player-exclusive behavior like 
     jumping, wall sliding, and setting the correct animation state based on movement.
     """
+    __slots__ = ('air_time', 'jumps', 'wall_slide', 'dashing', 'parry', 'impact')
+
     def __init__(self, game, pos, size):
         super().__init__(game, 'player', pos, size)  # Initialize as a PhysicsEntity with the 'player' sprite.
         self.air_time = 0        # Counts how many frames the player has been in the air.
@@ -307,14 +330,15 @@ class Player(PhysicsEntity):
 
         if abs(self.parry) > 0:
             # \(A . B=A_{x}B_{x}).
+            # Both the facing direction and the projectile velocity are horizontal, so their dot product
+            # is just direction * x_velocity. Negative means the projectile is coming towards the player.
+            # The direction and position don't change during the loop, so they are worked out once.
             # projectile = [position[x,y], x_velocity, lifetime_counter]
-            for projectile in self.game.projectiles.copy():
-               distance = projectile[0][0] - self.pos[0] 
-               direction = 1 if not self.flip else -1
-               player_direction = pygame.Vector2(direction, 0)
-               projectile_velocity= pygame.Vector2(projectile[1], 0)
-               if player_direction.dot(projectile_velocity) < 0 and abs(distance) < 10:
-                projectile[1] *= -1
+            direction = 1 if not self.flip else -1
+            player_x = self.pos[0]
+            for projectile in self.game.projectiles:
+                if direction * projectile[1] < 0 and abs(projectile[0][0] - player_x) < 10:
+                    projectile[1] *= -1
 
                 
     
@@ -337,17 +361,20 @@ class Player(PhysicsEntity):
             Vertical velocity is zero so particles only streak horizontally.
             """
             player_velocity = [abs(self.dashing / self.dashing * random.random() * 3), 0] 
-            self.game.particles.append(
-                Particle(self.game, 'particle', self.Rect().center, velocity=player_velocity, frame=random.randint(0, 7))
-            )
+            self.game.Spawn_Particle('particle', self.Rect().center, velocity=player_velocity, frame=random.randint(0, 7))
 
         # At the start or end of a dash (values 60 or 50), create a burst of particles.
         if abs(self.dashing) in {60, 50}:
+            # The functions called for every particle, and the point they all start from, are looked up once for the whole burst.
+            rand = random.random
+            randint = random.randint
+            spawn_particle = self.game.Spawn_Particle
+            center = self.Rect().center
             for i in range(20):      
                 # Pick a random angle for the particle burst.
-                angle = random.random() * math.pi * 2
+                angle = rand() * _TAU
                 # Random speed between 0.5 and 1.0.
-                speed = random.random() * 0.5 + 0.5
+                speed = rand() * 0.5 + 0.5
                 # Convert polar coordinates to velocity vector.
                 """
                     Polar coordinates define a point's location using:
@@ -369,18 +396,15 @@ class Player(PhysicsEntity):
                     - sin(θ) = opposite / hypotenuse = y / r  ->  y = r * sin(θ)
                 """
 
-                player_velocity = [speed * math.cos(angle), speed * math.sin(angle) ]
+                player_velocity = [speed * _cos(angle), speed * _sin(angle) ]
                 # Spawn a particle at the player's center.
-                self.game.particles.append(
-                    Particle(self.game, 'particle', self.Rect().center, velocity=player_velocity, frame=random.randint(0, 7))
-                )
+                spawn_particle('particle', center, velocity=player_velocity, frame=randint(0, 7))
 
 
         # --Apply horizontal friction to stop forced forwards velocity (deceleration)--
-        if self.velocity[0] > 0:  # Moving right, reduce speed toward 0.
-            self.velocity[0] = max(self.velocity[0] - 0.1, 0)
-        else:                     # Moving left, reduce speed toward 0.
-            self.velocity[0] = min(self.velocity[0] + 0.1, 0)
+        # Take 0.1 off the speed in whichever direction the player is moving, without going past 0.
+        velocity_x = self.velocity[0]
+        self.velocity[0] = velocity_x - math.copysign(min(0.1, abs(velocity_x)), velocity_x)
 
     def Render(self, surface, offset=(0, 0)):
         """
@@ -4,6 +4,9 @@ class Particle:
     Represents a single particle in the game world (e.g., a falling leaf).
     Handles its animation, position updates, and rendering.
     """
+    # Fixed attribute slots instead of a per-instance dict, as many particles are alive at once
+    __slots__ = ('game', 'type', 'pos', 'velocity', 'animation')
+
     def __init__(self, game, particle_type, pos, velocity=[0,0], frame=0):
         self.game = game
         self.type = particle_type
@@ -12,6 +15,20 @@ class Particle:
         # Create an animation copy for this particle so multiple particles can use the same asset independently.
         self.animation = self.game.assets['particle/' + particle_type].Copy()
         self.animation.frame = frame # Start at a random frame for variety
+
+    def Reset(self, particle_type, pos, velocity=[0, 0], frame=0):
+        """
+        Restarts a finished particle with new settings, so it can be reused instead of creating a new one.
+        The position and velocity lists are overwritten in place, and the animation is only copied again
+        if the particle changes type.
+        """
+        if particle_type != self.type:
+            self.type = particle_type
+            self.animation = self.game.assets['particle/' + particle_type].Copy()
+        self.animation.done = False
+        self.animation.frame = frame
+        self.pos[:] = pos
+        self.velocity[:] = velocity
   
     def Update(self):
         """
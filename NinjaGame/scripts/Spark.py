@@ -1,16 +1,32 @@
 import math
 import pygame
 
+# Bound once at import, as a spark works out its direction each time one is spawned or reused
+_cos = math.cos
+_sin = math.sin
+
 class Spark:
+    # Fixed attribute slots instead of a per-instance dict, as many sparks are alive at once
+    __slots__ = ('pos', 'angle', 'speed', 'direction')
+
     def __init__(self, pos, angle, speed):
         self.pos = list(pos)  # Spark's current position.
         self.angle = angle    # Movement direction in radians.
         self.speed = speed    # Speed (magnitude of velocity).
+        # Unit vector along the angle. A spark never turns, so this is worked out once rather than every frame.
+        self.direction = (_cos(angle), _sin(angle))
+
+    def Reset(self, pos, angle, speed):
+        # Restart a finished spark with new settings, so it can be reused instead of creating a new one.
+        self.pos[:] = pos
+        self.angle = angle
+        self.speed = speed
+        self.direction = (_cos(angle), _sin(angle))
 
     def Update(self):
         # Move sparks by converting their polar velocity (angle and speed) to Cartesian components.
-        self.pos[0] += math.cos(self.angle) * self.speed  # Horizontal movement based on angle and speed.
-        self.pos[1] += math.sin(self.angle) * self.speed  # Vertical movement based on angle and speed.
+        self.pos[0] += self.direction[0] * self.speed  # Horizontal movement based on angle and speed.
+        self.pos[1] += self.direction[1] * self.speed  # Vertical movement based on angle and speed.
         # Gradually reduce speed to simulate friction or air resistance.
         self.speed = max(0, self.speed - 0.1)
         # If speed has dropped to zero, return True to signal removal.
@@ -18,24 +34,21 @@ class Spark:
 
     def Render(self, surface, offset=(0, 0)):
         # Construct a diamond-shaped polygon pointing along the spark's movement.
+        # Every point is along the spark's direction or perpendicular to it, so instead of calling cos/sin
+        # for each angle, they are made from the direction by swapping and negating:
+        #   cos(a + π/2) = -sin(a), sin(a + π/2) = cos(a)
+        #   cos(a + π)   = -cos(a), sin(a + π)   = -sin(a)
+        #   cos(a - π/2) =  sin(a), sin(a - π/2) = -cos(a)
+        cos, sin = self.direction
+        x = self.pos[0] - offset[0]
+        y = self.pos[1] - offset[1]
+        length = self.speed * 3    # Distance to the front and back tips (scaled ×3 for a long tail).
+        width = self.speed * 0.5   # Distance to the sides.
         render_points = [
-            # Tip pointing forward (scaled ×3 for a long tail).
-            (self.pos[0] + math.cos(self.angle) * self.speed * 3 - offset[0],
-            self.pos[1] + math.sin(self.angle) * self.speed * 3 - offset[1]),
-            # Right side: perpendicular vector (angle + π/2).
-            (self.pos[0] + math.cos(self.angle + math.pi * 0.5) * self.speed * 0.5 - offset[0],
-            self.pos[1] + math.sin(self.angle + math.pi * 0.5) * self.speed * 0.5 - offset[1]),
-            # Back tip: reversed vector (angle + π).
-            (self.pos[0] + math.cos(self.angle + math.pi) * self.speed * 3 - offset[0],
-            self.pos[1] + math.sin(self.angle + math.pi) * self.speed * 3 - offset[1]),
-            # Left side: perpendicular vector (angle - π/2).
-            (self.pos[0] + math.cos(self.angle - math.pi * 0.5) * self.speed * 0.5 - offset[0],
-            self.pos[1] + math.sin(self.angle - math.pi * 0.5) * self.speed * 0.5 - offset[1]),
+            (x + cos * length, y + sin * length),  # Tip pointing forward.
+            (x - sin * width, y + cos * width),    # Right side: perpendicular vector (angle + π/2).
+            (x - cos * length, y - sin * length),  # Back tip: reversed vector (angle + π).
+            (x + sin * width, y - cos * width),    # Left side: perpendicular vector (angle - π/2).
         ]
         # The resulting polygon resembles a stretched diamond that shrinks as speed decreases.
         pygame.draw.polygon(surface, (255, 255, 255), render_points)
-      
-
-
-
-
@@ -1,5 +1,7 @@
 import pygame
 import json
+import sys
+from scripts.Utilities import blit_batch
 
 # AUTOTILE_MAP: Maps a set of neighboring directions to a specific tile variant index.
 # Each key is a tuple of directions (dx, dy) representing connected neighbors.
@@ -16,6 +18,15 @@ AUTOTILE_MAP = {
     tuple(sorted([(1, 0), (-1, 0), (0, 1), (0, -1)])): 8,     # all four directions
 }
 
+# The four directions AutoTile checks. Bit i of a neighbor mask is set when there is a same-type tile in direction i.
+AUTOTILE_DIRECTIONS = ((1, 0), (-1, 0), (0, -1), (0, 1))
+# AUTOTILE_MAP as a list indexed by neighbor mask (0-15), None where no variant matches.
+# This lets AutoTile look a variant up with an int instead of building and sorting a tuple for every tile.
+AUTOTILE_VARIANTS = [
+    AUTOTILE_MAP.get(tuple(sorted(shift for bit, shift in enumerate(AUTOTILE_DIRECTIONS) if mask & (1 << bit))))
+    for mask in range(16)
+]
+
 # Offsets for all 8 surrounding tiles plus the center tile.
 # Used to check which tiles exist near a position.
 NEIGHBOR_OFFSET = [(-1, 0), (-1, -1), (0, -1), (1, -1),
@@ -29,8 +40,9 @@ class Tilemap:
     def __init__(self, game, tile_size=16):
         self.tile_size = tile_size       # Width/height of a single tile in pixels
         self.game = game                 # Reference to the main game (for assets)
-        self.tilemap = {}                # Dictionary of grid-aligned tiles: {"x;y": {pos,type,variant}}
+        self.tilemap = {}                # Dictionary of grid-aligned tiles: {(x, y): {pos,type,variant}}
         self.offgrid_tiles = []          # Tiles not snapped to the grid (decorations)
+        self.tile_rects = {}             # Pixel-space collision rects by grid location, filled in as Physics_Rects_Around needs them
 
        
     def Extract(self, id_pairs, keep=False):
@@ -46,25 +58,34 @@ class Tilemap:
         Returns:
         - A list of matching tile dictionaries, with their positions converted to pixel coordinates.
         """
+        id_pairs = frozenset(id_pairs)  # Each tile is checked against the pairs, a set makes that a single hash lookup
         matches = []
         # --- Search off-grid tiles ---
-        for tile in self.offgrid_tiles.copy():
+        # A single pass that also builds the list of tiles left behind, instead of removing each match from the list
+        remaining = []
+        for tile in self.offgrid_tiles:
             if (tile['type'], tile['variant']) in id_pairs:
                 matches.append(tile.copy())        # Store a copy of the matched tile
-                if not keep:
-                    self.offgrid_tiles.remove(tile)  # Remove it from the list if not keeping
+                if keep:
+                    remaining.append(tile)
+            else:
+                remaining.append(tile)
+        self.offgrid_tiles = remaining             # Matches are left out if not keeping
 
         # --- Search on-grid tiles ---
-        for location in self.tilemap:
-            tile = self.tilemap[location]
+        # Matched locations are removed after the loop, as a dict can't change size while it is being iterated over
+        extracted = []
+        for location, tile in self.tilemap.items():
             if (tile['type'], tile['variant']) in id_pairs:
                 matches.append(tile.copy())         # Store a copy of the matched tile
                 # Convert tile position from grid coordinates to pixel coordinates
                 matches[-1]['pos'] = matches[-1]['pos'].copy()
                 matches[-1]['pos'][0] *= self.tile_size
                 matches[-1]['pos'][1] *= self.tile_size
-                if not keep:
-                    del self.tilemap[location]      # Remove the tile from the map if not keeping
+                extracted.append(location)
+        if not keep:
+            for location in extracted:
+                del self.tilemap[location]          # Remove the tile from the map if not keeping
         return matches
 
 
@@ -74,82 +95,108 @@ class Tilemap:
         Converts pos -> tile coordinates and checks all offsets in NEIGHBOR_OFFSET.
         """
         tiles = []
-        tile_location = (int(pos[0] // self.tile_size), int(pos[1] // self.tile_size))
+        tilemap = self.tilemap
+        x = int(pos[0] // self.tile_size)
+        y = int(pos[1] // self.tile_size)
         for offset in NEIGHBOR_OFFSET:
-            check_location = str(tile_location[0] + offset[0]) + ';' + str(tile_location[1] + offset[1])
-            if check_location in self.tilemap:
-                tiles.append(self.tilemap[check_location])
+            tile = tilemap.get((x + offset[0], y + offset[1]))
+            if tile:
+                tiles.append(tile)
         return tiles
     
     def Physics_Rects_Around(self, pos):
         """
         Return pygame.Rect objects for all solid tiles around a position.
-        These rects are used for collision detection.
+        These rects are used for collision detection and must not be modified by the caller.
+        A tile's rect depends only on its grid location, so each one is made the first time it is
+        needed and kept in self.tile_rects, which stays valid when tiles are added or removed.
         """
         rects = []
+        tile_rects = self.tile_rects
+        tile_size = self.tile_size
         for tile in self.Tiles_Around(pos):
             if tile['type'] in PHYSICS_TILES:  # Only consider solid tiles
-                rects.append(
-                    pygame.Rect(
-                        tile['pos'][0] * self.tile_size,
-                        tile['pos'][1] * self.tile_size,
-                        self.tile_size,
-                        self.tile_size
-                    )
-                )
+                location = (tile['pos'][0], tile['pos'][1])
+                rect = tile_rects.get(location)
+                if rect is None:
+                    rect = pygame.Rect(location[0] * tile_size, location[1] * tile_size, tile_size, tile_size)
+                    tile_rects[location] = rect
+                rects.append(rect)
         return rects
     
-    def Render(self, surface, offset=(0, 0)):
+    def Render(self, surface, offset=(0, 0), scale=1):
         """
         Draw all tiles on the given surface, shifted by the camera offset.
         First draw off-grid decorations, then draw grid-aligned tiles
         only within the visible screen area.
-        """
+        The (image, position) pairs are collected and drawn with a single batched call.
+        scale multiplies every screen position, for assets that were pre-scaled by the same amount (used by the editor).
+        """
+        draws = []
+        # Everything the loops below read is looked up once here rather than for every tile
+        add_draw = draws.append
+        assets = self.game.assets
+        tile_size = self.tile_size
+        tilemap_get = self.tilemap.get
+        offset_x, offset_y = offset
+
         # Draw non-grid tiles directly (e.g., decorations)
+        # Positions are snapped to whole low-res pixels before scaling, as a scaled-up low-res surface would be
         for tile in self.offgrid_tiles:
-            surface.blit(
-                self.game.assets[tile['type']][tile['variant']],
-                (tile['pos'][0] - offset[0], tile['pos'][1] - offset[1])
-            )
+            add_draw((
+                assets[tile['type']][tile['variant']],
+                (int(tile['pos'][0] - offset_x) * scale, int(tile['pos'][1] - offset_y) * scale)
+            ))
 
        
         """
         Draws the visible portion of the grid-aligned tiles which improves performance for large maps.
 
         - offset[0] // tile_size -> converts the first tile (top left of the screen) from pos to tile coordinates in the x axis
-        - (offset[0] + surface.get_width()) // tile_size + 1 -> converts the last tile (bottom right of the screen) from pos to tile coordinates in the x axis, + 1 as range() ends at 1 less than the stop value
+        - (offset[0] + view_width) // tile_size + 1 -> converts the last tile (bottom right of the screen) from pos to tile coordinates in the x axis, + 1 as range() ends at 1 less than the stop value
+        - view_width is the surface width in unscaled pixels
         - Same applies for the y-axis
         - For each visible tile, we:
             • Look up its image using tile['type'] and tile['variant'].
             • Multiply tile['pos'] by tile_size to convert grid coords -> world coords.
-            • Subtract offset to place it correctly relative to the camera.
-        """
-        for x in range(offset[0] // self.tile_size, (offset[0] + surface.get_width()) // self.tile_size + 1):
-            for y in range(offset[1] // self.tile_size, (offset[1] + surface.get_height()) // self.tile_size + 1):
-                location = str(x) + ';' + str(y)
-                if location in self.tilemap:
-                    tile = self.tilemap[location]
-                    surface.blit(
-                        self.game.assets[tile['type']][tile['variant']],
-                        (tile['pos'][0] * self.tile_size - offset[0],
-                         tile['pos'][1] * self.tile_size - offset[1])
-                    )
+            • Subtract offset to place it correctly relative to the camera, then multiply by scale.
+        """
+        view_width = int(surface.get_width() / scale)
+        view_height = int(surface.get_height() / scale)
+        visible_rows = range(offset_y // tile_size, (offset_y + view_height) // tile_size + 1)
+        for x in range(offset_x // tile_size, (offset_x + view_width) // tile_size + 1):
+            for y in visible_rows:
+                # A single dict lookup per visible cell, empty cells give None and are skipped
+                tile = tilemap_get((x, y))
+                if tile:
+                    add_draw((
+                        assets[tile['type']][tile['variant']],
+                        ((tile['pos'][0] * tile_size - offset_x) * scale,
+                         (tile['pos'][1] * tile_size - offset_y) * scale)
+                    ))
+
+        blit_batch(surface, draws)
 
     def Save(self, path):
         """
         Save the current tilemap state to a JSON file.
         Includes the tilemap dictionary, tile size, and off-grid tiles.
+        JSON only allows string keys, so (x, y) keys are written out as "x;y".
         """
+        tilemap = {}
+        for location, tile in self.tilemap.items():
+            tilemap[str(location[0]) + ';' + str(location[1])] = tile
+
         with open(path, 'w') as f:
             json.dump(
-                {'tilemap': self.tilemap,
+                {'tilemap': tilemap,
                  'tile_size': self.tile_size,
                  'offgrid': self.offgrid_tiles},
                 f, indent=4
             )
     
     def Solid_Check(self ,pos):
-        tile_location = str(int(pos[0] // self.tile_size)) + ';' + str(int(pos[1] // self.tile_size))
+        tile_location = (int(pos[0] // self.tile_size), int(pos[1] // self.tile_size))
         if tile_location in self.tilemap:
             if self.tilemap[tile_location]['type'] in PHYSICS_TILES:
                 return self.tilemap[tile_location]
@@ -157,40 +204,52 @@ class Tilemap:
     def Load(self, path):
         """
         Load tilemap data from a JSON file and restore state.
+        The "x;y" string keys from the file are converted back to (x, y) tuples.
+        Tile type names are interned, so the type checks in collisions and autotiling
+        compare the same string object instead of comparing characters.
         """
         with open(path, 'r') as f:
             map_data = json.load(f)
 
-        self.tilemap = map_data['tilemap']
+        self.tilemap = {}
+        for location, tile in map_data['tilemap'].items():
+            x, y = location.split(';')
+            tile['type'] = sys.intern(tile['type'])
+            self.tilemap[(int(x), int(y))] = tile
         self.tile_size = map_data['tile_size']
+        self.tile_rects = {}  # The cached rects may be for a different tile size
         self.offgrid_tiles = map_data['offgrid']
+        for tile in self.offgrid_tiles:
+            tile['type'] = sys.intern(tile['type'])
 
     def AutoTile(self):
         """
         Automatically chooses which tile variant to display based on its neighbors.
         
         Logic for autotiling:
-        - For every tile in self.tilemap:
-            • Check the four important directions: right (1,0), left (-1,0), up (0,-1), down (0,1).
+        - For every tile in self.tilemap whose type supports autotiling:
+            • Check the four important directions in AUTOTILE_DIRECTIONS: right (1,0), left (-1,0), up (0,-1), down (0,1).
             • For each neighbor in these directions:
-                – Build a string key like "x;y" for the neighbor’s grid location.
+                – Build a tuple key (x, y) for the neighbor’s grid location.
                 – If that location exists and is the same type as the current tile,
-                  add the direction vector to a set called neighbors.
-            • Sort and convert neighbors to a tuple so it can be matched reliably
-              (order doesn’t matter, sorting makes the tuple hashable and comparable).
-            • Look up this tuple in AUTOTILE_MAP to find the correct variant index.
+                  set the direction's bit in the neighbor mask.
+            • Look up the mask in AUTOTILE_VARIANTS (AUTOTILE_MAP indexed by mask) to find the correct variant index.
             • Update tile['variant'] so edges, corners, and center tiles match visually.
         - This creates smooth transitions between tiles: corners, edges, T-junctions, etc.
         """
-        for loc in self.tilemap:
-            tile = self.tilemap[loc]
-            neighbors = set()
+        tilemap = self.tilemap
+        for tile in tilemap.values():
+            tile_type = tile['type']
+            if tile_type not in AUTOTILE_TYPES:
+                continue
+            x, y = tile['pos']
+            mask = 0
             # Check each of the four directions for same-type neighbors
-            for shift in [(1, 0), (-1, 0), (0, -1), (0, 1)]:
-                check_loc = str(tile['pos'][0] + shift[0]) + ';' + str(tile['pos'][1] + shift[1])
-                if check_loc in self.tilemap and self.tilemap[check_loc]['type'] == tile['type']:
-                    neighbors.add(shift)
-            neighbors = tuple(sorted(neighbors))
-            # If the tile type supports autotiling and neighbors match a pattern, update its variant
-            if (tile['type'] in AUTOTILE_TYPES) and (neighbors in AUTOTILE_MAP):
-                tile['variant'] = AUTOTILE_MAP[neighbors]
+            for bit, shift in enumerate(AUTOTILE_DIRECTIONS):
+                neighbor = tilemap.get((x + shift[0], y + shift[1]))
+                if neighbor and neighbor['type'] == tile_type:
+                    mask |= 1 << bit
+            # If the neighbors match a pattern, update the variant
+            variant = AUTOTILE_VARIANTS[mask]
+            if variant is not None:
+                tile['variant'] = variant
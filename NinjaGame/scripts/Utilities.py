@@ -1,28 +1,47 @@
+import copy
+import functools
 import os
 import pygame
 
 BASE_IMG_PATH = 'data/images/'  # Base folder where all images are stored
+HAS_FBLITS = hasattr(pygame.Surface, 'fblits')  # fblits only exists on pygame-ce
 
+@functools.lru_cache(maxsize=None)
 def load_image(path):
     """
     Loads a single image from disk, converts it for fast blitting,
     and sets black (0,0,0) as transparent.
+    Images with no black pixels are left without a colorkey, so SDL can copy them
+    with its plain opaque blitter instead of checking every pixel against the key.
+    Each path is only read from disk once, later calls return the same Surface,
+    so the returned image must not be drawn onto or have its colorkey changed.
     """
     image = pygame.image.load(BASE_IMG_PATH + path).convert()  # Load and convert for performance
-    image.set_colorkey((0, 0, 0))  # Make black pixels transparent
+    if pygame.mask.from_threshold(image, (0, 0, 0), (1, 1, 1, 255)).count():  # Any pure black pixels?
+        image.set_colorkey((0, 0, 0))  # Make black pixels transparent
     return image
 
 def load_images(path):
     """
     Loads all images in a folder into a list.
     The files are sorted alphabetically so animation frames are in order.
-    Returns a list of Pygame surfaces.
+    Returns a new list of Pygame surfaces, the surfaces themselves are shared through load_image's cache.
     """
     images = []
     for image_name in sorted(os.listdir(BASE_IMG_PATH + path)):  # Loop through all files in folder
         images.append(load_image(path + '/' + image_name))        # Load each image and append
     return images                                                 # Return full list of images
 
+def blit_batch(surface, blit_list):
+    """
+    Draws a list of (image, position) pairs onto a surface in one call.
+    Uses fblits when available (pygame-ce), otherwise falls back to blits.
+    """
+    if HAS_FBLITS:
+        surface.fblits(blit_list)
+    else:
+        surface.blits(blit_list, doreturn=False)
+
 class Animation:
     """
     Represents a looping or one-time animation using a list of images.
@@ -34,13 +53,22 @@ class Animation:
         self.image_duration = image_duration # Frames to display each image before advancing
         self.done = False                   # Flag for when a non-looping animation has finished
         self.frame = 0                      # Current frame counter
+        # The image to show on every frame counter value, so Image() is a plain index instead of a division.
+        # The same frames mirrored horizontally are used for entities facing left. Both tables are made once
+        # here and shared with every copy, rather than flipping the current frame each time it is drawn
+        self.frame_images = [images[i // image_duration] for i in range(image_duration * len(images))]
+        flipped_images = [pygame.transform.flip(image, True, False) for image in images]
+        self.flipped_frame_images = [flipped_images[i // image_duration] for i in range(len(self.frame_images))]
 
     def Copy(self):
         """
-        Creates a new Animation with the same images and settings.
-        Note: shares the same image list to save memory.
+        Creates a new Animation with the same images and settings, starting from the first frame.
+        Note: shares the same image lists and frame tables to save memory.
         """
-        return Animation(self.images, self.image_duration, self.loop)
+        animation = copy.copy(self)
+        animation.done = False
+        animation.frame = 0
+        return animation
     
     def Update(self):
         """
@@ -48,19 +76,19 @@ class Animation:
         - For looping animations: wraps around after the last frame.
         - For non-looping animations: stops at the last frame and sets done=True.
         """
+        frame_count = len(self.frame_images)  # image_duration * len(images)
         if self.loop:
             # Wrap around using modulo for infinite looping
-            self.frame = (self.frame + 1) % (self.image_duration * len(self.images))
+            self.frame = (self.frame + 1) % frame_count
         else:
             # Increase frame but clamp to the last frame index
-            self.frame = min(self.frame + 1, self.image_duration * len(self.images) - 1)
+            self.frame = min(self.frame + 1, frame_count - 1)
             # If we’ve reached the end, mark animation as done
-            if self.frame >= self.image_duration * len(self.images) - 1:
+            if self.frame >= frame_count - 1:
                 self.done = True
     
-    def Image(self):
+    def Image(self, flip=False):
         """
-        Returns the current frame’s image to be drawn.
-        Uses integer division to pick the correct frame based on image_duration.
+        Returns the current frame’s image to be drawn, mirrored horizontally if flip is True.
         """
-        return self.images[int(self.frame / self.image_duration)]
+        return (self.flipped_frame_images if flip else self.frame_images)[self.frame]